@@ -12,7 +12,7 @@ Key Features:
     - Error handling and retry mechanisms
     - Support for large file transfers with progress tracking
 Main Functions:
-    mkdir(): Creates directories using rclone mkdir command
+    mkdir(): Creates directories through the rclone rcd daemon
     complete_list_check(): Compares source and destination folder structures
     large_folder_backup_with_analysis(): Performs file-level backup with change analysis
 Configuration:
@@ -40,34 +40,63 @@ import logging
 import os
 from datetime import datetime
 from collections import deque
-import csv
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import json
+import subprocess
+import tempfile
 import toml
 import argparse
 import sys
+from rclone_papi_rc import start_rc_daemon, stop_rc_daemon, rc_call  # shared rclone rcd client (scripts/rclone_papi_rc.py)
+from rclone_papi_csv import read_folder_pairs  # shared CSV folder list reader (scripts/rclone_papi_csv.py)
 
 csv_file = "rclone_papi_folder_list.csv"
 log_folder = "log"
+concurrent_pairs = 1  # number of source-target pairs processed in parallel worker processes
 
 # -----------------------------------------------------------------------
 
 start_datetime = datetime.now().strftime('%Y-%m-%d-%H%M%S')
 filemode = 'w'  #w - appendwrite always new, a -append. When w, it's useful for debugging
 
-# Ensure the log folder exists
-if not os.path.exists(log_folder):
-    os.makedirs(log_folder)
-
-# Add this before logging.basicConfig to clear any existing handlers and ensure logs go only to the file
-logging.getLogger().handlers = []  # Clear all existing handlers to prevent console output
-
-# Set up logging with detailed format including timestamps
-# Adjusted format to handle multi-line messages better by including newline handling
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename=f'{log_folder}/{start_datetime}_rclone_papi.log.txt',  # Redirect logs to this file
-    filemode=filemode   # 'w' to overwrite each run; change to 'a' to append    
-)
+def setup_logging():
+    """Send log records to the run's log file in log_folder (no console output)."""
+    # Ensure the log folder exists
+    os.makedirs(log_folder, exist_ok=True)
+
+    # Add this before logging.basicConfig to clear any existing handlers and ensure logs go only to the file
+    logging.getLogger().handlers = []  # Clear all existing handlers to prevent console output
+
+    # Set up logging with detailed format including timestamps
+    # Adjusted format to handle multi-line messages better by including newline handling
+    logging.basicConfig(
+        level=logging.INFO, 
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        filename=f'{log_folder}/{start_datetime}_rclone_papi.log.txt',  # Redirect logs to this file
+        filemode=filemode   # 'w' to overwrite each run; change to 'a' to append    
+    )
+
+def apply_config(config: dict):
+    """Set the module-level settings from a loaded TOML configuration."""
+    global csv_file, log_folder, concurrent_pairs
+    global user_check, user_transfers, user_checkers, user_multi_thread_streams, user_low_level_retries
+    global user_retries, user_retries_sleep, user_timeout, user_max_backlog
+
+    # Extract user input
+    csv_file = config['csv_file']
+    log_folder = config['log_folder']
+    concurrent_pairs = config.get('concurrent_pairs', 1)
+
+    # Extract tweaking parameters
+    user_check = config['user_check']
+    user_transfers = config['user_transfers']
+    user_checkers = config['user_checkers']
+    user_multi_thread_streams = config['user_multi_thread_streams']
+    user_low_level_retries = config['user_low_level_retries']
+    user_retries = config['user_retries']
+    user_retries_sleep = config['user_retries_sleep']
+    user_timeout = config['user_timeout']
+    user_max_backlog = config['user_max_backlog']
 
 # Custom logging handler to capture warnings and multi-line errors
 import warnings
@@ -78,78 +107,170 @@ class RcloneWarningFilter(logging.Filter):
         return super().filter(record)
 
 
-def mkdir(rclone: Rclone, path: str):
-    """Helper function to create a directory using rclone."""
+# rclone.conf location and Rclone object, resolved once per process and shared by all pairs
+rclone_config_path = None
+rclone_client = None
+
+def resolve_config_path() -> Path:
+    """Return the rclone.conf path, detected from APPDATA on first use (adjust for other OS if needed)."""
+    global rclone_config_path
+    if rclone_config_path is None:
+        appdata_path = os.environ.get('APPDATA')
+        if not appdata_path:
+            raise ValueError("APPDATA environment variable not found. Set it or hardcode the config path.")
+        config_path = Path(appdata_path) / 'rclone' / 'rclone.conf'
+        if not config_path.exists():
+            raise FileNotFoundError(f"rclone.conf not found at {config_path}. Create it via 'rclone config'.")
+        rclone_config_path = config_path
+    return rclone_config_path
+
+def get_rclone() -> Rclone:
+    """Return the process-wide Rclone object, creating it on first use."""
+    global rclone_client
+    if rclone_client is None:
+        rclone_client = Rclone(resolve_config_path())
+    return rclone_client
+
+def mkdir(root: str, rel_path: str):
+    """Helper function to create the directory rel_path below root using the rclone rcd daemon."""
+    path = f"{root}/{rel_path}"
     try:
-        cmd = ['mkdir', path]
-        rclone.impl._run(cmd, check=True, capture=False)
+        rc_call('operations/mkdir', {'fs': root, 'remote': rel_path})
         logging.info(f"Successfully created directory: {path}")
     except Exception as e:
         logging.error(f"Failed to create directory {path}: {str(e)}")
         raise
 
-def complete_list_check(root_src: str, root_dst: str, dry_run: bool = True):
-    # Initialize Rclone (reusing your script's config detection logic)
-    appdata_path = os.environ.get('APPDATA')
-    if not appdata_path:
-        raise ValueError("APPDATA environment variable not found. Set it or hardcode the config path.")
-    config_path = Path(appdata_path) / 'rclone' / 'rclone.conf'
-    if not config_path.exists():
-        raise FileNotFoundError(f"rclone.conf not found at {config_path}. Create it via 'rclone config'.")
-    rclone = Rclone(config_path)
+def trie_add(trie: dict, path: str):
+    """Add a '/'-separated folder path to a nested-dict trie, interning each path segment.
+
+    Leaf folders are stored as None; a folder's dict is only created once it gets its first child.
+    """
+    node = trie
+    *parents, leaf = path.split('/')
+    for segment in parents:
+        segment = sys.intern(segment)
+        child = node.get(segment)
+        if child is None:
+            child = node[segment] = {}  # new folder, or a leaf that gets its first child
+        node = child
+    leaf = sys.intern(leaf)
+    if leaf not in node:
+        node[leaf] = None
+
+def trie_paths(trie: dict, prefix: str = ''):
+    """Yield all folder paths stored in the trie, parents before children."""
+    for segment in sorted(trie):
+        path = f"{prefix}{segment}"
+        yield path
+        if trie[segment]:
+            yield from trie_paths(trie[segment], f"{path}/")
+
+def trie_diff(trie_a: dict, trie_b: dict, prefix: str = ''):
+    """Yield folder paths present in trie_a but not in trie_b in sorted order; a missing folder yields its whole subtree."""
+    for segment in sorted(trie_a):
+        child_a = trie_a[segment]
+        path = f"{prefix}{segment}"
+        if segment not in trie_b:
+            yield path
+            if child_a:
+                yield from trie_paths(child_a, f"{path}/")
+        elif child_a:
+            yield from trie_diff(child_a, trie_b[segment] or {}, f"{path}/")
+
+# Backend ListR (recursive listing) support per remote name, looked up once per session
+list_r_support = {}
+
+def remote_name(path: str) -> str:
+    """Return the 'remote:' prefix of an rclone path, or '' for local paths (including Windows drive letters)."""
+    name, sep, _ = path.partition(':')
+    if not sep or len(name) == 1 or '/' in name or '\\' in name:
+        return ''
+    return name + ':'
+
+def supports_list_r(rclone: Rclone, path: str) -> bool:
+    """Check (and cache) whether the backend of the path supports ListR, i.e. benefits from --fast-list."""
+    remote = remote_name(path)
+    if not remote:
+        return False  # the local backend has no ListR
+    if remote not in list_r_support:
+        try:
+            result = rclone.impl._run(['backend', 'features', remote], check=True, capture=True)
+            list_r_support[remote] = bool(json.loads(result.stdout).get('Features', {}).get('ListR', False))
+        except Exception as e:
+            logging.warning(f"Could not read backend features of {remote}, assuming ListR support: {str(e)}")
+            list_r_support[remote] = True
+        logging.info(f"Backend {remote} ListR support: {list_r_support[remote]}")
+    return list_r_support[remote]
+
+def complete_list_check(root_src: str, root_dst: str, dry_run: bool = True, rclone: Rclone = None):
+    # Reuse the process-wide Rclone object unless one is passed in
+    config_path = resolve_config_path()
+    if rclone is None:
+        rclone = get_rclone()
 
     logging.info(f"Starting folder structure check for source: {root_src} -> destination: {root_dst} (dry_run={dry_run})")
 
     # Helper to collect folder structure using lsjson (recursive, filter for dirs)
-    def collect_structure(path: str, is_source: bool) -> set:
+    # Folders are stored in a trie of interned path segments, so repeated prefixes are kept only once
+    def collect_structure(path: str, is_source: bool) -> dict:
+        # --fast-list only pays off on backends with native recursive listing (ListR);
+        # elsewhere it just buffers the whole listing, so directories are listed in parallel instead
+        if supports_list_r(rclone, path):
+            listing_args = ['--fast-list']
+        else:
+            listing_args = ['--checkers', str(user_checkers)]
         try:
-            # Use lsjson for recursive listing; adjust args for dirs_only if supported
-            listing = rclone.lsjson(
-                path=path,
-                recursive=True,
-                other_args=["--fast-list", "--dirs-only"]  # --dirs-only to get only folders
-            )
-            # Assuming listing is a list of dicts or DirListing objects; adjust based on actual return type
-            structure = set(item['Path'] for item in listing if item['IsDir'])
-            logging.info(f"Collected {len(structure)} folders from {'source' if is_source else 'target'}.")
-            return structure
-        except AttributeError:
-            # Fallback if lsjson not directly available: raw command
-            cmd = ['lsjson', path, '--recursive', '--fast-list', '--dirs-only']
-            result = rclone.impl._run(cmd, check=True, capture=True)
-            import json
-            listing = json.loads(result.stdout)
-            structure = set(item['Path'] for item in listing if item['IsDir'])
-            logging.info(f"Collected {len(structure)} folders from {'source' if is_source else 'target'} (via fallback).")
+            # rclone_api has no lsjson method, so lsjson is run directly with the rclone executable it resolved
+            # (from PATH or its own download); the output is one JSON object per line, so it is parsed while
+            # streaming from the pipe instead of loading the whole listing into memory at once
+            cmd = [str(rclone.impl._exec.rclone_exe), '--config', str(config_path), 'lsjson', path, '--recursive',
+                   *listing_args, '--dirs-only', '--no-modtime', '--no-mimetype']  # --dirs-only to get only folders, skip unused fields
+            structure = {}
+            folder_count = 0
+            with tempfile.TemporaryFile(mode='w+', encoding='utf-8') as stderr_file:
+                with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True, encoding='utf-8') as proc:
+                    for line in proc.stdout:
+                        line = line.strip().rstrip(',')
+                        if line in ('', '[', ']'):
+                            continue
+                        item = json.loads(line)
+                        if item['IsDir']:
+                            trie_add(structure, item['Path'])
+                            folder_count += 1
+                if proc.returncode != 0:
+                    stderr_file.seek(0)
+                    raise RuntimeError(f"lsjson {path} failed with exit status {proc.returncode}: {stderr_file.read()}")
+            logging.info(f"Collected {folder_count} folders from {'source' if is_source else 'target'}.")
             return structure
         except Exception as e:
             logging.error(f"Failed to collect {'source' if is_source else 'target'} structure: {str(e)}")
             raise
 
-    # Step 1: Collect source folder structure
-    logging.info("Collecting source folder structure...")
-    source_list = collect_structure(root_src, is_source=True)
-
-    # Step 2: Collect target folder structure
-    logging.info("Collecting target folder structure...")
-    target_structure = collect_structure(root_dst, is_source=False)
+    # Step 1 + 2: Collect source and target folder structures in parallel (independent remotes)
+    logging.info("Collecting source and target folder structures...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        source_future = executor.submit(collect_structure, root_src, True)
+        target_future = executor.submit(collect_structure, root_dst, False)
+        source_list = source_future.result()
+        target_structure = target_future.result()
 
     # Step 3: Save both structures to folder_list.txt
     log_file_path = f'{log_folder}/{start_datetime}_folder_list.txt'
     try:
-        with open(log_file_path, filemode, encoding='utf-8') as f:  # Use filemode for write/append
+        # Large write buffer + writelines over generators: few write calls without building the whole file in memory
+        with open(log_file_path, filemode, encoding='utf-8', buffering=1 << 20) as f:  # Use filemode for write/append
             f.write(f"ST,DRIVE,PATH\n")
-            for path in sorted(source_list):
-                f.write(f"SOURCE,{root_src},{path}\n")
-            for path in sorted(target_structure):
-                f.write(f"TARGET,{root_dst},{path}\n")
+            f.writelines(f"SOURCE,{root_src},{path}\n" for path in trie_paths(source_list))
+            f.writelines(f"TARGET,{root_dst},{path}\n" for path in trie_paths(target_structure))
         logging.info(f"Saved folder structures to {log_file_path}")
     except Exception as e:
         logging.error(f"Failed to save folder lists: {str(e)}")
 
     # Step 4: Compare and identify differences
-    to_create = sorted(source_list - target_structure)  # Folders missing on target
-    to_delete = sorted(target_structure - source_list)  # Extra folders on target
+    # trie_diff walks siblings in sorted order, so no global sort over the full path strings is needed
+    to_create = list(trie_diff(source_list, target_structure))  # Folders missing on target
+    to_delete = list(trie_diff(target_structure, source_list))  # Extra folders on target
 
     if dry_run:
         logging.info("Dry run mode: No folder creations or deletions performed.")
@@ -160,57 +281,76 @@ def complete_list_check(root_src: str, root_dst: str, dry_run: bool = True):
     # logging.info("Starting folder creations...")
     # created_count = 0
     # for rel_path in to_create:
-    #     full_dst_path = f"{root_dst}/{rel_path}".rstrip('/')  # Avoid trailing slash issues
     #     try:
-    #         mkdir(rclone, full_dst_path)  # Reuse your mkdir helper
+    #         mkdir(root_dst, rel_path)  # Reuse your mkdir helper
     #         created_count += 1
     #     except Exception as e:
-    #         logging.error(f"Failed to create {full_dst_path}: {str(e)}")
+    #         logging.error(f"Failed to create {root_dst}/{rel_path}: {str(e)}")
     # logging.info(f"Created {created_count} folders successfully.")
 
     # Step 6: Perform deletions (deepest first to avoid parent-child conflicts)
+    # Folders of the same depth are independent, so each depth level is purged in parallel
+    # and the next (shallower) level starts only after the current one has finished.
     logging.info(f"Starting folder deletions purging")
-    # Sort deepest first (by number of path components)
-    sorted_to_delete = sorted(to_delete, key=lambda p: len(p.split('/')), reverse=True)
     deleted_count = 0
-    for rel_path in sorted_to_delete:
-        full_dst_path = f"{root_dst}/{rel_path}".rstrip('/')
-        try:
-            result = rclone.impl._run(['purge', full_dst_path], check=True, capture=True)
-            logging.info(f"Purged folder and contents: {full_dst_path}")            
-            deleted_count += 1
-        except Exception as e:
-            error_msg = str(e).lower()
-            # Try to capture stderr if available
-            try:
-                result = e.__context__  # Access underlying result if possible
-                if hasattr(result, 'stderr'):
-                    error_msg += f" (stderr: {result.stderr})"
-            except:
-                pass
-            if "directory not empty" in error_msg:
-                logging.warning(f"Skipped non-empty folder {full_dst_path}: {error_msg}")
-            elif "not found" in error_msg or "exit status 3" in error_msg:
-                logging.warning(f"Folder already deleted or not found {full_dst_path}: {error_msg}")
-            else:
-                logging.error(f"Failed to delete {full_dst_path}: {error_msg}")
+    if to_delete:
+        start_rc_daemon(config_path, rclone.impl._exec.rclone_exe)
+        # Counting sort by depth: str.count('/') needs no allocation, and bucket index = depth
+        depth_buckets = []
+        for rel_path in to_delete:
+            depth = rel_path.count('/')
+            while len(depth_buckets) <= depth:
+                depth_buckets.append([])
+            depth_buckets[depth].append(rel_path)
+        # Relative paths from the listing never end with '/', so the prefix is built once and no per-path rstrip is needed
+        dst_prefix = root_dst + '/'
+        with ThreadPoolExecutor(max_workers=user_checkers) as executor:
+            for bucket in reversed(depth_buckets):
+                futures = {}
+                for rel_path in bucket:
+                    # All purges go through the same root fs, so rcd reuses one Fs and its pacer
+                    # (shared throttling and backoff) instead of building a new Fs per folder
+                    future = executor.submit(rc_call, 'operations/purge', {'fs': root_dst, 'remote': rel_path})
+                    futures[future] = dst_prefix + rel_path
+                for future in as_completed(futures):
+                    full_dst_path = futures[future]
+                    try:
+                        future.result()
+                        logging.info("Purged folder and contents: %s", full_dst_path)
+                        deleted_count += 1
+                    except Exception as e:
+                        error_msg = str(e).lower()
+                        # Try to capture stderr if available
+                        try:
+                            result = e.__context__  # Access underlying result if possible
+                            if hasattr(result, 'stderr'):
+                                error_msg += f" (stderr: {result.stderr})"
+                        except:
+                            pass
+                        if "directory not empty" in error_msg:
+                            logging.warning("Skipped non-empty folder %s: %s", full_dst_path, error_msg)
+                        elif "not found" in error_msg or "exit status 3" in error_msg:
+                            logging.warning("Folder already deleted or not found %s: %s", full_dst_path, error_msg)
+                        else:
+                            logging.error("Failed to delete %s: %s", full_dst_path, error_msg)
     logging.info(f"Purged {deleted_count} folders successfully.")
 
     logging.info("Folder structure sync completed.")
 
 
 
-def large_folder_backup_with_analysis(root_src: str, root_dst: str, dry_run: bool = True):
-    # Automatically detect rclone.conf on Windows (adjust for other OS if needed)
-    appdata_path = os.environ.get('APPDATA')
-    if not appdata_path:
-        raise ValueError("APPDATA environment variable not found. Set it or hardcode the config path.")
-    
-    config_path = Path(appdata_path) / 'rclone' / 'rclone.conf'
-    if not config_path.exists():
-        raise FileNotFoundError(f"rclone.conf not found at {config_path}. Create it via 'rclone config'.")
-    
-    rclone = Rclone(config_path)
+# Log tag for each diff type; None means the item is not logged
+diff_tags = {
+    DiffType.MISSING_ON_DST: 'NEWFILE',
+    DiffType.DIFFERENT: 'CHANGED',
+    DiffType.MISSING_ON_SRC: 'DELETED',
+    DiffType.EQUAL: None,
+}
+
+def large_folder_backup_with_analysis(root_src: str, root_dst: str, dry_run: bool = True, rclone: Rclone = None):
+    # Reuse the process-wide Rclone object unless one is passed in
+    if rclone is None:
+        rclone = get_rclone()
     
     # Step 1: Change analysis phase - compute all differences upfront and create diffs variable
     logging.info("Starting change analysis phase: Computing all differences...")
@@ -229,23 +369,29 @@ def large_folder_backup_with_analysis(root_src: str, root_dst: str, dry_run: boo
 
     # logging.info(f"diffs: {diffs}")    
     
-    # Log planned actions from diffs
+    # Log planned actions from diffs and, in the same pass, collect files to copy/update and delete
+    to_copy = []
+    to_delete = []
+    append_copy = to_copy.append
+    append_delete = to_delete.append
+    log_info = logging.info
+    dst_prefix = root_dst + '/'
     logging.info("-" * 100)
     logging.info("Planned actions based on differences:")
     if diffs:
         logging.info("")
-        for item in sorted(diffs, key=lambda x: (str(x.type).lower(), x.path.lower())):
-            match item.type:
-                case DiffType.MISSING_ON_DST:
-                    logging.info(f"NEWFILE {item.path}")
-                case DiffType.DIFFERENT:
-                    logging.info(f"CHANGED {item.path}")
-                case DiffType.MISSING_ON_SRC:
-                    logging.info(f"DELETED {item.path}")
-                case DiffType.EQUAL:
-                    pass
-                case _:
-                    logging.info(f"UNKNOWN {item.path}")
+        # Build the lowercase sort keys once per item; the index breaks ties so items are never compared
+        decorated = [(str(d.type).lower(), d.path.lower(), i, d) for i, d in enumerate(diffs)]
+        decorated.sort()
+        for _, _, _, item in decorated:
+            tag = diff_tags.get(item.type, 'UNKNOWN')
+            if tag is None:
+                continue
+            log_info("%s %s", tag, item.path)  # lazy %-formatting: per-diff hot loop
+            if tag == 'NEWFILE' or tag == 'CHANGED':
+                append_copy(item.path)
+            elif tag == 'DELETED':
+                append_delete(dst_prefix + item.path)
     logging.info("-" * 100)
 
     logging.info("Differentiation analysis complete.")
@@ -258,39 +404,26 @@ def large_folder_backup_with_analysis(root_src: str, root_dst: str, dry_run: boo
     def perform_sync():
         logging.info("Starting sync operations using diffs only")
 
-        # Collect files to copy/update and delete from diffs
-        to_copy = []
-        to_delete = []
-        for item in diffs:
-            if item.type == DiffType.MISSING_ON_DST or item.type == DiffType.DIFFERENT:
-                to_copy.append(item.path)
-            elif item.type == DiffType.MISSING_ON_SRC:
-                to_delete.append(f"{root_dst}/{item.path}")
-
         # Log planned actions
         logging.info(f"Planned copies/updates: {len(to_copy)} files")
         logging.info(f"Planned deletions: {len(to_delete)} files")
 
-        # Collect and create necessary parent directories for copies (derived from to_copy paths)
-        from pathlib import Path
-        needed_dirs = set()
-        for path in to_copy:
-            p = Path(path)
-            for parent in p.parents:
-                if str(parent) != '.':
-                    needed_dirs.add(f"{root_dst}/{parent}")
-
-
         # Perform copies if any
+        # When the transfers allow more than one concurrent rclone process, copy_files splits the files
+        # by common folder and runs the parts in parallel
         if to_copy:
             logging.info(f"Copying {len(to_copy)} files...")
+            max_workers = max(1, user_transfers // user_multi_thread_streams)
+            copy_transfers = max(1, user_transfers // max_workers)
+            if max_workers > 1:
+                logging.info(f"Copying with {max_workers} concurrent rclone processes, {copy_transfers} transfers each")
             try:
                 copy_results = rclone.copy_files(
                     src=root_src,
                     dst=root_dst,
                     files=to_copy,
                     check=user_check,
-                    transfers=user_transfers,
+                    transfers=copy_transfers,
                     checkers=user_checkers,
                     multi_thread_streams=user_multi_thread_streams,
                     low_level_retries=user_low_level_retries,
@@ -298,6 +431,7 @@ def large_folder_backup_with_analysis(root_src: str, root_dst: str, dry_run: boo
                     retries_sleep=user_retries_sleep,
                     timeout=user_timeout,
                     max_backlog=user_max_backlog,
+                    max_partition_workers=max_workers,
                     other_args=["--progress", "--stats=1m"]
                 )
                 failed = [res for res in copy_results if res.returncode != 0]
@@ -334,6 +468,20 @@ def large_folder_backup_with_analysis(root_src: str, root_dst: str, dry_run: boo
     else:
         logging.info("Dry run mode: No actual operations performed (analysis only).")        
 
+
+def sync_pair(pair_id: int, src: str, dst: str, config: dict, run_datetime: str):
+    """Process one source-target pair in a worker process, logging to its own pair-specific files."""
+    global start_datetime
+    apply_config(config)
+    start_datetime = f"{run_datetime}_pair{pair_id}"
+    setup_logging()
+    try:
+        logging.info(f"Processing source: {src} -> destination: {dst}")
+        complete_list_check(src, dst, dry_run=False)  # Set dry_run=False to perform actions
+        large_folder_backup_with_analysis(src, dst, dry_run=False)  # Set dry_run=False to perform actions
+    finally:
+        stop_rc_daemon()
+
 # ----------------------------------------------------------------------------------------------------------------------------
 if __name__ == "__main__":
     # Parse command line arguments
@@ -346,50 +494,39 @@ if __name__ == "__main__":
     try:
         with open(config_file, 'r') as f:
             config = toml.load(f)
-        
-        # Extract user input
-        csv_file = config['csv_file']
-        log_folder = config['log_folder']
-
-        # Extract tweaking parameters
-        user_check = config['user_check']
-        user_transfers = config['user_transfers']
-        user_checkers = config['user_checkers']
-        user_multi_thread_streams = config['user_multi_thread_streams']
-        user_low_level_retries = config['user_low_level_retries']
-        user_retries = config['user_retries']
-        user_retries_sleep = config['user_retries_sleep']
-        user_timeout = config['user_timeout']
-        user_max_backlog = config['user_max_backlog']
+        apply_config(config)
 
     except FileNotFoundError:
         print(f"Config file {config_file} not found.")
+        setup_logging()  # default log_folder
         logging.warning(f"Config file {config_file} not found.")
         sys.exit(1)
     except Exception as e:
         print(f"Error loading config file {config_file}: {e}")
+        setup_logging()  # default log_folder
         logging.error(f"Error loading config file {config_file}: {e}")
         sys.exit(1)
 
+    # Log into the log_folder from the TOML file
+    setup_logging()
+
+    # Locate rclone.conf once for the whole run (also fails early if it is missing)
+    try:
+        resolve_config_path()
+    except Exception as e:
+        print(f"Error locating rclone config: {e}")
+        logging.error(f"Error locating rclone config: {e}")
+        sys.exit(1)
+
 
     logging.info(f"-" * 200)
     logging.info(f"START SYNCING FOLDERS FROM CSV FILE: {csv_file}")
     logging.info(f"Using config file: {config_file}")
     logging.info(f"-" * 200)
-    # Read source-target pairs from CSV file
-    folders_to_sync = []
     
     try:
-        with open(csv_file, mode='r', newline='', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            next(reader)  # Skip header row (source, target)
-            for row in reader:
-                if len(row) < 2 or not row[0].strip() or not row[1].strip():
-                    continue  # Skip empty/invalid rows
-                src = row[0].strip().replace('\\', '/')  # Normalize to forward slashes
-                dst = row[1].strip().strip('"')  # Strip quotes and whitespace
-                folders_to_sync.append((src, dst))
-
+        # Read source-target pairs from CSV file
+        folders_to_sync = read_folder_pairs(csv_file)
        
         if not folders_to_sync:
             logging.warning("No valid source-target pairs found in the CSV file.")
@@ -400,10 +537,27 @@ if __name__ == "__main__":
                 logging.info(f"Destination: {dst}")
                 logging.info("")
 
-            for src, dst in folders_to_sync:
-                logging.info(f"-" * 200)
-                logging.info(f"Processing source: {src} -> destination: {dst}")
-                complete_list_check(src, dst, dry_run=False)  # Set dry_run=False to perform actions
-                large_folder_backup_with_analysis(src, dst, dry_run=False)  # Set dry_run=False to perform actions
+            if concurrent_pairs > 1:
+                # Independent pairs run in separate worker processes, each with its own Rclone session
+                # and its own log files ({start_datetime}_pair<N>_...)
+                logging.info(f"Processing {len(folders_to_sync)} pairs with {concurrent_pairs} concurrent workers")
+                with ProcessPoolExecutor(max_workers=concurrent_pairs) as executor:
+                    futures = {
+                        executor.submit(sync_pair, pair_id, src, dst, config, start_datetime): (pair_id, src, dst)
+                        for pair_id, (src, dst) in enumerate(folders_to_sync, start=1)
+                    }
+                    for future in as_completed(futures):
+                        pair_id, src, dst = futures[future]
+                        try:
+                            future.result()
+                            logging.info(f"Pair {pair_id} completed: {src} -> {dst}")
+                        except Exception as e:
+                            logging.error(f"Pair {pair_id} failed: {src} -> {dst}: {str(e)}")
+            else:
+                for src, dst in folders_to_sync:
+                    logging.info(f"-" * 200)
+                    logging.info(f"Processing source: {src} -> destination: {dst}")
+                    complete_list_check(src, dst, dry_run=False)  # Set dry_run=False to perform actions
+                    large_folder_backup_with_analysis(src, dst, dry_run=False)  # Set dry_run=False to perform actions
     except Exception as e:
-        logging.error(f"Error reading or processing CSV file: {str(e)}")
\ No newline at end of file
+        logging.error(f"Error reading or processing CSV file: {str(e)}")
@@ -0,0 +1,19 @@
+"""
+CSV folder list reader shared by the rclone_papi scripts
+
+Both the sync script and the structure check read the same source-target pairs
+through read_folder_pairs(), so a row is either processed by both or skipped by both.
+
+"""
+import csv
+
+
+def read_folder_pairs(csv_file: str) -> list:
+    """Read (source, target) pairs from the CSV file, skipping the header and empty/invalid rows."""
+    with open(csv_file, mode='r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file, skipinitialspace=True)  # handles the quoted values after ', '
+        next(reader, None)  # Skip header row (source, target)
+        # Strip whitespace and quotes of all rows in one pass
+        rows = [(row[0].strip(), row[1].strip().strip('"')) for row in reader if len(row) >= 2]
+    # Normalize sources to forward slashes and drop rows with an empty source or target
+    return [(src.replace('\\', '/'), dst) for src, dst in rows if src and dst]
@@ -5,42 +5,87 @@ Rclone Process Monitor
 This provides information which files are currenntly handled by rclone.
 """
 
+import os
 import re
+import sys
+
+rclone_name = re.compile(r'rclone', re.IGNORECASE)  # matches rclone process names without lowercasing them
+
+
+def iter_rclone_processes():
+    """Yield (pid, cmdline) of running rclone processes.
+
+    On Linux only /proc/<pid>/comm is read for every process and the cmdline is read
+    just for rclone ones; other platforms use psutil.
+    """
+    if sys.platform.startswith('linux'):
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                # Process names and arguments are arbitrary bytes; undecodable ones are replaced instead of raising
+                with open(f'/proc/{pid}/comm', encoding='utf-8', errors='replace') as f:
+                    comm = f.read().strip()
+                if not rclone_name.search(comm):
+                    continue
+                with open(f'/proc/{pid}/cmdline', encoding='utf-8', errors='replace') as f:
+                    cmdline = f.read().rstrip('\0').split('\0')
+            except OSError:
+                continue  # process exited or is not accessible
+            yield int(pid), cmdline
+    else:
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            try:
+                if proc.info['name'] and rclone_name.search(proc.info['name']):
+                    yield proc.info['pid'], proc.info['cmdline']
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+
+def list_user_open_files(pid):
+    """Return paths of files opened by the process, excluding system files.
+
+    On Linux the /proc/<pid>/fd symlinks are read directly; other platforms use psutil.
+    """
+    if sys.platform.startswith('linux'):
+        user_files = []
+        for entry in os.scandir(f'/proc/{pid}/fd'):
+            try:
+                target = os.readlink(entry.path)
+            except OSError:
+                continue  # fd was closed meanwhile
+            # Skip sockets, pipes, devices and other non-user files
+            if target.startswith(('/proc', '/dev', '/sys', '/usr', 'socket:', 'pipe:', 'anon_inode:')):
+                continue
+            user_files.append(target)
+        return user_files
+    # Filter out files from c:\windows (case-insensitive)
+    return [f.path for f in psutil.Process(pid).open_files() if not f.path.lower().startswith(r'c:\windows')]
+
 
 def show_running_rclone_jobs():
     print("Running rclone jobs (with source, target, and current file if available):")
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+    for pid, cmdline in iter_rclone_processes():
+        source = target = "N/A"
+        if len(cmdline) >= 4 and cmdline[1] == "sync":
+            source = cmdline[2]
+            target = cmdline[3]
+        print("--------------------------------------------------------------------------------------------------------------------------")
+        print("--------------------------------------------------------------------------------------------------------------------------")
+        print(f"PID: {pid}, Source: {source}, Target: {target}, CMD: {' '.join(cmdline)}")
+        # Try to show currently copied file (if any)
         try:
-            if proc.info['name'] and 'rclone' in proc.info['name'].lower():
-                cmdline = proc.info['cmdline']
-                source = target = "N/A"
-                if len(cmdline) >= 4 and cmdline[1] == "sync":
-                    source = cmdline[2]
-                    target = cmdline[3]
-                print("--------------------------------------------------------------------------------------------------------------------------")
-                print("--------------------------------------------------------------------------------------------------------------------------")
-                print(f"PID: {proc.info['pid']}, Source: {source}, Target: {target}, CMD: {' '.join(cmdline)}")
-                # Try to show currently copied file (if any)
-                try:
-                    p = psutil.Process(proc.info['pid'])
-                    open_files = p.open_files()
-                    # Filter out files from c:\windows (case-insensitive)
-                    user_files = [f.path for f in open_files if not f.path.lower().startswith(r'c:\windows')]
-                    user_files.sort()  # Sort file paths alphabetically
-                    if user_files:
-                        print("-------------------------------------------------------------")
-                        print("Open files (may include currently copied file):")
-                        for path in user_files:
-                            print(f"    {path}")
-                    else:
-                        for line in p.cmdline():
-                            match = re.search(r'--progress', line)
-                            if match:
-                                print("  Progress flag detected, but cannot read live progress from subprocess.")
-                except Exception as e:
-                    print(f"  Could not determine current file: {e}")
-        except (psutil.NoSuchProcess, psutil.AccessDenied, IndexError):
-            continue
+            user_files = list_user_open_files(pid)
+            user_files.sort()  # Sort file paths alphabetically
+            if user_files:
+                print("-------------------------------------------------------------")
+                print("Open files (may include currently copied file):")
+                for path in user_files:
+                    print(f"    {path}")
+            elif any('--progress' in line for line in cmdline):
+                print("  Progress flag detected, but cannot read live progress from subprocess.")
+        except Exception as e:
+            print(f"  Could not determine current file: {e}")
 
 
 def kill_process(pid):
@@ -0,0 +1,175 @@
+"""
+Rclone rc client shared by the rclone_papi scripts
+
+Starts one persistent rclone remote control daemon (rclone rcd) per run and sends
+JSON-RPC requests to it, so that listings, mkdir and purge calls don't pay process
+startup, config parsing and token refresh each time. The daemon only listens on
+127.0.0.1 and requires a random user and password generated for each run.
+
+"""
+from pathlib import Path
+import atexit
+import base64
+import codecs
+import http.client
+import json
+import logging
+import os
+import secrets
+import socket
+import subprocess
+import threading
+import time
+
+try:
+    import orjson  # optional: parses listings several times faster than the json module
+except ImportError:
+    orjson = None
+json_loads = orjson.loads if orjson is not None else json.loads
+
+rc_daemon = None
+rc_addr = None
+rc_auth = None  # Basic auth header value of the random per-run rc user
+rc_local = threading.local()  # one keep-alive HTTP connection per thread
+
+def start_rc_daemon(config_path: Path, rclone_exe: Path, extra_args: list = ()) -> str:
+    """Start the rclone rcd daemon if it is not running yet and return its address.
+
+    extra_args are added to the rclone rcd command line, e.g. ['--tpslimit', '10'] to limit
+    the API calls of all requests sent to the daemon together.
+    """
+    global rc_daemon, rc_addr, rc_auth
+    if rc_daemon is not None:
+        return rc_addr
+    # Let the OS pick a free local port
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    rc_addr = f"127.0.0.1:{port}"
+    # A random user and password per run keep other local processes from calling rc methods
+    # (config/dump would return the remotes' tokens); they are passed through the environment
+    # so they don't show up in the process list
+    user = secrets.token_urlsafe(16)
+    password = secrets.token_urlsafe(32)
+    rc_auth = 'Basic ' + base64.b64encode(f"{user}:{password}".encode('utf-8')).decode('ascii')
+    env = dict(os.environ, RCLONE_RC_USER=user, RCLONE_RC_PASS=password)
+    cmd = [str(rclone_exe), '--config', str(config_path), 'rcd', f'--rc-addr={rc_addr}', *extra_args]
+    rc_daemon = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    atexit.register(stop_rc_daemon)
+    # Wait until the daemon accepts requests
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            rc_call('rc/noop', {})
+            break
+        except OSError:
+            if rc_daemon.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"rclone rcd daemon did not start on {rc_addr}")
+            time.sleep(0.2)
+    logging.info(f"Started rclone rcd daemon on {rc_addr}")
+    return rc_addr
+
+def stop_rc_daemon():
+    """Stop the rclone rcd daemon started by start_rc_daemon()."""
+    global rc_daemon
+    if rc_daemon is None:
+        return
+    rc_daemon.terminate()
+    try:
+        rc_daemon.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        rc_daemon.kill()
+    rc_daemon = None
+
+def rc_call(command: str, params: dict) -> dict:
+    """Send a JSON-RPC request to the rclone rcd daemon and return the decoded response."""
+    conn = getattr(rc_local, 'conn', None)
+    if conn is None:
+        conn = rc_local.conn = http.client.HTTPConnection(rc_addr)
+    try:
+        conn.request('POST', f'/{command}', body=json.dumps(params),
+                     headers={'Content-Type': 'application/json', 'Authorization': rc_auth})
+        response = conn.getresponse()
+        result = json_loads(response.read() or b'{}')
+    except (http.client.HTTPException, OSError):
+        conn.close()
+        rc_local.conn = None
+        raise
+    if response.status != 200:
+        raise RuntimeError(f"rc {command} failed: {result.get('error', response.reason)}")
+    return result
+
+def rc_stream_list(command: str, params: dict, key: str = 'list'):
+    """Send a JSON-RPC request to the rclone rcd daemon and yield the items of the response's list one by one.
+
+    The response is decoded incrementally while it is read from the socket, so the full JSON
+    document is never held in memory on the Python side. rcd builds the whole result before it
+    writes any bytes, so decoding only overlaps with receiving the response, not with the listing.
+    """
+    conn = getattr(rc_local, 'conn', None)
+    if conn is None:
+        conn = rc_local.conn = http.client.HTTPConnection(rc_addr)
+    completed = False  # the connection can only be reused if the response was read completely
+    try:
+        conn.request('POST', f'/{command}', body=json.dumps(params),
+                     headers={'Content-Type': 'application/json', 'Authorization': rc_auth})
+        response = conn.getresponse()
+        if response.status != 200:
+            result = json_loads(response.read() or b'{}')
+            completed = True
+            raise RuntimeError(f"rc {command} failed: {result.get('error', response.reason)}")
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder('utf-8')()
+        buf = ''
+        pos = 0
+        in_list = False
+        while True:
+            chunk = response.read(1 << 16)
+            buf = buf[pos:] + utf8.decode(chunk, final=not chunk)
+            pos = 0
+            if not in_list:
+                # Find the start of the list value: "<key>": [ ... ]  (or null when empty)
+                key_pos = buf.find(f'"{key}"')
+                colon_pos = buf.find(':', key_pos) if key_pos >= 0 else -1
+                value = buf[colon_pos + 1:].lstrip() if colon_pos >= 0 else ''
+                if value.startswith('null'):
+                    response.read()
+                    completed = True
+                    return
+                if not value.startswith('['):
+                    if not chunk:
+                        raise ValueError(f"rc {command} response has no '{key}' list")
+                    continue
+                pos = len(buf) - len(value) + 1
+                in_list = True
+            if orjson is not None:
+                # rclone writes the response tab-indented, so each list item ends with a "\n\t\t}" line;
+                # all complete items of the buffer are decoded by orjson in one call
+                end = buf.rfind('\n\t\t}', pos)
+                if end >= 0:
+                    end += 4
+                    try:
+                        items = orjson.loads('[' + buf[pos:end].lstrip(' \t\r\n,') + ']')
+                    except orjson.JSONDecodeError:
+                        pass  # unexpected layout, decode item by item below
+                    else:
+                        yield from items
+                        pos = end
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buf) and buf[pos] == ']':
+                    response.read()  # rest of the document
+                    completed = True
+                    return
+                try:
+                    item, pos = decoder.raw_decode(buf, pos)
+                except ValueError:
+                    break  # the item continues in the next chunk
+                yield item
+            if not chunk:
+                raise ValueError(f"rc {command} response ended inside the '{key}' list")
+    finally:
+        if not completed:
+            conn.close()
+            rc_local.conn = None
@@ -19,50 +19,169 @@ Features:
 - File attribute comparison (size, modification time)
 
 Requirements:
-- rclone_api Python package
+- rclone_api Python package (finds rclone on PATH or downloads it; listings run through one "rclone rcd" daemon per run)
 - Valid rclone.conf configuration
 - CSV file with source,destination pairs
 
 """
-from rclone_api import Rclone
 from pathlib import Path
+import argparse
 import logging
+import logging.handlers
+import mmap
 import os
 from datetime import datetime
 import csv
+import gzip
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import sys
+import threading
+import time
+import zlib
+from rclone_api import Rclone
+from rclone_papi_rc import start_rc_daemon, rc_call, rc_stream_list, json_loads  # shared rclone rcd client (scripts/rclone_papi_rc.py)
+from rclone_papi_csv import read_folder_pairs  # shared CSV folder list reader (scripts/rclone_papi_csv.py)
 
 # USER INPUT
 csv_file = 'rclone_papi_folder_list.csv'  # Path to your CSV file
 log_folder = 'log'  # You can change this to a full path if needed, e.g., '/path/to/log'
+dump_full_list = False  # Also save the complete source and target file lists (_st_check_filelist.txt), not only the differences
+compress_output = False  # Write the difflist and filelist gzip-compressed (.txt.gz), useful for very large outputs
+listing_cache_ttl = 0  # Seconds a cached listing (log_folder/.cache) is reused by repeated runs; 0 disables the cache
+include_hash = False  # List CRC-32 of every file; slow on remotes without stored hashes
+fetch_changed_crc = False  # Without include_hash: fetch CRC-32 of changed files of equal size and don't report those with equal CRC-32; only if both backends have crc32 (OneDrive and crypt don't)
+tps_limit = 0  # Max API transactions per second of all pairs together (rclone --tpslimit); 0 means no limit
+tps_limit_burst = 1  # Max transactions burst above tps_limit (rclone --tpslimit-burst)
 # -----------------------------------------------------------------------
 
 start_datetime = datetime.now().strftime('%Y-%m-%d-%H%M%S')
 
-# Ensure the log folder exists
-if not os.path.exists(log_folder):
-    os.makedirs(log_folder)
-
-# Add this before logging.basicConfig to clear any existing handlers and ensure logs go only to the file
-logging.getLogger().handlers = []  # Clear all existing handlers to prevent console output
-
-# Set up logging with detailed format including timestamps
-# Adjusted format to handle multi-line messages better by including newline handling
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename=f'{log_folder}/{start_datetime}_st_check.log.txt',  # Redirect logs to this file
-    filemode='w'  # 'w' to overwrite each run; change to 'a' to append    
-)
-
-# Custom logging handler to capture warnings and multi-line errors
-import warnings
-class RcloneWarningFilter(logging.Filter):
-    def filter(self, record):
-        if "UserWarning" in record.msg or "NOTICE" in record.msg:
-            return True
-        return super().filter(record)
-
-def complete_file_list_check(root_src: str, root_dst: str, dry_run: bool = True):
+def setup_logging(log_folder: str, thread_names: bool = False):
+    """Send log records to this run's log file in log_folder (no console output)."""
+    # Ensure the log folder exists (no separate existence check, so no race with other runs)
+    Path(log_folder).mkdir(parents=True, exist_ok=True)
+
+    # Add this before logging.basicConfig to clear any existing handlers and ensure logs go only to the file
+    logging.getLogger().handlers = []  # Clear all existing handlers to prevent console output
+
+    # Set up logging with detailed format including timestamps
+    # Adjusted format to handle multi-line messages better by including newline handling
+    file_handler = logging.FileHandler(
+        Path(log_folder) / f'{start_datetime}_st_check.log.txt',  # Redirect logs to this file
+        mode='w'  # 'w' to overwrite each run; change to 'a' to append
+    )
+    # With parallel pairs the worker thread name (pair<N>) tells interleaved lines apart
+    log_format = '%(asctime)s - %(threadName)s - %(levelname)s - %(message)s' if thread_names else '%(asctime)s - %(levelname)s - %(message)s'
+    file_handler.setFormatter(logging.Formatter(log_format))
+    # Records are buffered and written to the file in batches; errors and shutdown flush immediately
+    memory_handler = logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+    logging.basicConfig(level=logging.INFO, handlers=[memory_handler])
+
+def is_modtime_different(source_modtime: str, target_modtime: str) -> bool:
+    """Compare two rclone ModTime strings ('YYYY-MM-DDTHH:MM:SS[.fraction]<zone>') up to seconds precision."""
+    if source_modtime == target_modtime:
+        return False  # common case for synced files, no parsing needed
+    # With the same time zone suffix, the first 19 characters are the time truncated to seconds
+    source_zone = source_modtime[19:].lstrip('.0123456789')
+    target_zone = target_modtime[19:].lstrip('.0123456789')
+    if source_zone == target_zone:
+        return source_modtime[:19] != target_modtime[:19]
+    # Different time zones: parse mod_time strings and compare only up to seconds precision
+    try:
+        source_dt = datetime.fromisoformat(source_modtime.replace('Z', '+00:00'))
+        target_dt = datetime.fromisoformat(target_modtime.replace('Z', '+00:00'))
+        # Compare only year, month, day, hour, minute, second (ignore microseconds)
+        source_truncated = source_dt.replace(microsecond=0)
+        target_truncated = target_dt.replace(microsecond=0)
+        return source_truncated != target_truncated
+    except (ValueError, TypeError):
+        # Fallback to string comparison if parsing fails
+        return True
+
+def open_output(file_name: str, pair_name: str = ''):
+    """Open an output CSV file in log_folder for writing, gzip-compressed if compress_output is set."""
+    path = Path(log_folder) / f'{start_datetime}{pair_name}_{file_name}'
+    if compress_output:
+        return gzip.open(path.with_name(f'{path.name}.gz'), 'wt', newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+def is_local_path(path: str) -> bool:
+    """Return True if path is on the local filesystem, i.e. has no 'remote:' prefix (drive letters are local)."""
+    name, sep, _ = path.partition(':')
+    return not sep or len(name) == 1 or '/' in name or '\\' in name
+
+def local_crc32(root: str, path: str) -> str:
+    """Compute the CRC-32 of a local file in-process (zlib uses hardware CRC instructions where available)."""
+    file_path = os.path.join(root, path)
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return f"{zlib.crc32(b''):08x}"  # empty files can't be memory-mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return f"{zlib.crc32(mm):08x}"
+    except (OSError, ValueError) as e:
+        logging.warning(f"Failed to compute CRC-32 of {file_path}: {str(e)}")
+        return ''
+
+# Backend CRC-32 support per remote root, looked up once per session (operations/fsinfo)
+crc32_support = {}
+
+def supports_crc32(root: str) -> bool:
+    """Check (and cache) whether the CRC-32 of files below root can be fetched; local files are hashed in-process."""
+    if is_local_path(root):
+        return True
+    if root not in crc32_support:
+        try:
+            hashes = rc_call('operations/fsinfo', {'fs': root}).get('Hashes') or []
+            crc32_support[root] = 'crc32' in hashes
+        except Exception as e:
+            logging.warning(f"Could not read hash types of {root}, assuming no CRC-32: {str(e)}")
+            crc32_support[root] = False
+        logging.info(f"Backend of {root} CRC-32 support: {crc32_support[root]}")
+    return crc32_support[root]
+
+def find_rclone_config() -> Path:
+    """Automatically detect rclone.conf in APPDATA."""
+    appdata_path = os.environ.get('APPDATA')
+    if not appdata_path:
+        raise ValueError("APPDATA environment variable not found. Set it or hardcode the config path.")
+    
+    config_path = Path(appdata_path) / 'rclone' / 'rclone.conf'
+    if not config_path.exists():
+        raise FileNotFoundError(f"rclone.conf not found at {config_path}. Create it via 'rclone config'.")
+    return config_path
+
+def listing_cache_path(root: str) -> Path:
+    """Return the cache file of a listed root; the hash setting is part of the key since it changes the content."""
+    key = hashlib.sha1(f"{root}|{include_hash}".encode('utf-8')).hexdigest()
+    return Path(log_folder) / '.cache' / f'{key}.json'
+
+def load_cached_listing(root: str):
+    """Return the cached structure of root if it is younger than listing_cache_ttl, else None."""
+    cache_file = listing_cache_path(root)
+    try:
+        if time.time() - cache_file.stat().st_mtime > listing_cache_ttl:
+            return None
+        with open(cache_file, 'rb') as f:
+            cached = json_loads(f.read())
+    except (OSError, ValueError):
+        return None  # no cache yet or unreadable cache, list again
+    logging.info(f"Using cached listing of {root} from {cache_file}")
+    return {path: tuple(entry) for path, entry in cached.items()}
+
+def save_cached_listing(root: str, structure: dict):
+    """Save the structure of root for reuse by runs within listing_cache_ttl (delete the file to invalidate)."""
+    cache_file = listing_cache_path(root)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(structure, f)
+    except OSError as e:
+        logging.warning(f"Failed to save listing cache {cache_file}: {str(e)}")
+
+def complete_file_list_check(root_src: str, root_dst: str, dry_run: bool = True, dump_full_list: bool = False, pair_name: str = ''):
     """
     Function to collect and compare full folder and file structures of source and target,
     log differences, and perform necessary folder creation or deletion on the target.
@@ -71,149 +190,179 @@ def complete_file_list_check(root_src: str, root_dst: str, dry_run: bool = True)
         root_src (str): Source path for comparison.
         root_dst (str): Destination path for comparison and operations.
         dry_run (bool): If True, only analyze and log without performing operations.
+        dump_full_list (bool): If True, also save the complete source and target file lists.
+        pair_name (str): Suffix added to the output file names, e.g. '_pair2' when pairs run in parallel.
+
+    The rclone rcd daemon must already be running (see start_rc_daemon()); it is started once
+    per run and shared by all pairs.
     """
-    # Automatically detect rclone.conf
-    appdata_path = os.environ.get('APPDATA')
-    if not appdata_path:
-        raise ValueError("APPDATA environment variable not found. Set it or hardcode the config path.")
-    
-    config_path = Path(appdata_path) / 'rclone' / 'rclone.conf'
-    if not config_path.exists():
-        raise FileNotFoundError(f"rclone.conf not found at {config_path}. Create it via 'rclone config'.")
-    
-    rclone = Rclone(config_path)
     
-    # Helper function to perform lsjson via _run (since lsjson method is not directly available)
-    def rclone_lsjson(path: str, recursive: bool = True, files_only: bool = True, hash: bool = True):
-        cmd = ['lsjson', path]
-        if recursive:
-            cmd.append('--recursive')
-        if files_only:
-            cmd.append('--files-only')
-        # Note: To include both files and dirs, omit --files-only and --dirs-only (default behavior)
-        if hash:
-            cmd.append('--hash')
+    # Helper function to perform the lsjson equivalent (operations/list) on the rclone rcd daemon
+    def rclone_lsjson(path: str, recursive: bool = True, files_only: bool = True, hash: bool = False, fast_list: bool = True):
+        # The full path is passed as fs, so returned paths are relative to it like with lsjson
+        # Note: To include both files and dirs, set files_only=False
+        # MimeType is never used, so it is not requested (smaller response)
+        opt = {'recurse': recursive, 'filesOnly': files_only, 'showHash': hash, 'noMimeType': True}
+        params = {'fs': path, 'remote': '', 'opt': opt}
+        if fast_list:
+            # Same as --fast-list --checkers=16: recursive ListR on backends that support it (S3, Drive, ...)
+            params['_config'] = {'UseListR': True, 'Checkers': 16}
         try:
-            result = rclone.impl._run(cmd, check=True, capture=True)
-            # Assuming the output is JSON, parse it
-            import json
-            return json.loads(result.stdout)
+            # Items are yielded while the response is still being received
+            yield from rc_stream_list('operations/list', params)
         except Exception as e:
             logging.error(f"Failed to run lsjson on {path}: {str(e)}")
             raise
+
+    # Helper function to fetch the CRC-32 of a single file (operations/stat); '' if the backend has none
+    def rclone_crc32(root: str, path: str) -> str:
+        opt = {'showHash': True, 'hashTypes': ['crc32'], 'noMimeType': True}
+        try:
+            item = rc_call('operations/stat', {'fs': root, 'remote': path, 'opt': opt}).get('item') or {}
+            return item.get('Hashes', {}).get('crc32', '')
+        except Exception as e:
+            logging.warning(f"Failed to get CRC-32 of {root}/{path}: {str(e)}")
+            return ''
     
     # Step 1: Collect full structure of source and target with attributes
     logging.info("Collecting full structure of source and target...")
     
+    # Helper function to collect the structure of one side as a dict keyed by path with (mod_time, size, crc)
+    # tuples, filled directly from the listing (files only, so no is_dir flag is kept)
+    def collect_structure(path: str) -> dict:
+        if listing_cache_ttl > 0:
+            structure = load_cached_listing(path)
+            if structure is not None:
+                return structure
+        structure = {}
+        # The local backend has no ListR, so local roots are listed without the fast-list settings
+        listing = rclone_lsjson(path, recursive=True, files_only=True, hash=include_hash, fast_list=not is_local_path(path))
+        # Hot loop over every file: item.get is bound once per item, and hashes are only looked up when listed
+        if include_hash:
+            for item in listing:
+                get = item.get
+                hashes = get('Hashes')
+                crc = hashes.get('crc32', '') if hashes else ''
+                structure[get('Path', '')] = (get('ModTime', ''), get('Size', -1), crc)
+        else:
+            for item in listing:
+                get = item.get
+                structure[get('Path', '')] = (get('ModTime', ''), get('Size', -1), '')
+        if listing_cache_ttl > 0:
+            save_cached_listing(path, structure)
+        return structure
+
     try:
-        # Get source structure (include both files and dirs)
-        source_list = rclone_lsjson(root_src, recursive=True, files_only=True, hash=True)
-        source_structure = []
-        for item in source_list:
-            path = item.get('Path', '')
-            mod_time = item.get('ModTime', '')
-            size = item.get('Size', -1)
-            crc = item.get('Hashes', {}).get('CRC-32', '') if 'Hashes' in item else ''
-            source_structure.append({
-                'path': path,
-                'mod_time': mod_time,
-                'size': size,
-                'crc': crc,
-                'is_dir': item.get('IsDir', False)
-            })
-        
-        # Get target structure (include both files and dirs)
-        target_list = rclone_lsjson(root_dst, recursive=True, files_only=True, hash=True)
-        target_structure = []
-        for item in target_list:
-            path = item.get('Path', '')
-            mod_time = item.get('ModTime', '')
-            size = item.get('Size', -1)
-            crc = item.get('Hashes', {}).get('CRC-32', '') if 'Hashes' in item else ''
-            target_structure.append({
-                'path': path,
-                'mod_time': mod_time,
-                'size': size,
-                'crc': crc,
-                'is_dir': item.get('IsDir', False)
-            })
+        # Source and target are independent remotes, so both are listed in parallel
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source_future = executor.submit(collect_structure, root_src)
+            target_future = executor.submit(collect_structure, root_dst)
+            source = source_future.result()
+            target = target_future.result()
        
-        logging.info(f"Collected {len(source_structure)} items from source.")
-        logging.info(f"Collected {len(target_structure)} items from target.")
+        logging.info(f"Collected {len(source)} items from source.")
+        logging.info(f"Collected {len(target)} items from target.")
         
-        # Step 2: Save structures to file
-        with open(f'{log_folder}/{start_datetime}_st_check_filelist.txt', 'w', encoding='utf-8') as f:
-            f.write("DRIVE,PATH,MODTIME,SIZE,CRC,ISDIR\n")
-            for item in sorted(source_structure, key=lambda x: x['path'].lower()):
-                f.write(f"SOURCE,{item['path']},{item['mod_time']},{item['size']},{item['crc']},{item['is_dir']}\n")
-            for item in sorted(target_structure, key=lambda x: x['path'].lower()):
-                f.write(f"TARGET,{item['path']},{item['mod_time']},{item['size']},{item['crc']},{item['is_dir']}\n")
-        logging.info(f"Saved source and target structures to {log_folder}/{start_datetime}_st_check_filelist.txt")
+        # Step 2: Save structures to file (optional, it is a full O(N) write on every run)
+        if dump_full_list:
+            # csv.writer quotes paths containing commas and writes rows in C
+            with open_output('st_check_filelist.txt', pair_name) as f:
+                writer = csv.writer(f)
+                writer.writerow(['DRIVE', 'PATH', 'MODTIME', 'SIZE', 'CRC', 'ISDIR'])
+                # Case-insensitive order: casefold keys are computed once per path and the decorated rows are
+                # sorted as plain tuples (no key function calls)
+                for drive, structure in (('SOURCE', source), ('TARGET', target)):
+                    rows = [(path.casefold(), drive, path, mod_time, size, crc, False)
+                            for path, (mod_time, size, crc) in structure.items()]
+                    rows.sort()
+                    writer.writerows(row[1:] for row in rows)
+            logging.info(f"Saved source and target structures to {f.name}")
         
         
         # Step 3: Compare structures to identify differences
         logging.info("Comparing source and target structures...")
         
-        # Create dictionaries for faster lookup
-        source_dict = {item['path']: item for item in source_structure}
-        target_dict = {item['path']: item for item in target_structure}
-        
-        # Get all unique paths
-        all_paths = set(source_dict.keys()) | set(target_dict.keys())
+        # Split paths with C-level dict view set operations, so each group only reads the side(s) it needs
+        only_in_source = source.keys() - target.keys()
+        only_in_target = target.keys() - source.keys()
+        in_both = source.keys() & target.keys()
 
         differences = []
         
-        for path in sorted(all_paths):
-            source_item = source_dict.get(path)
-            target_item = target_dict.get(path)
+        # Files exist in source but not in target
+        for path in sorted(only_in_source):
+            source_modtime, source_size, _ = source[path]
+            differences.append({
+                'type': 'MISSING_IN_TARGET',
+                'path': path,
+                'source_size': source_size,
+                'source_modtime': source_modtime,
+                'target_size': None,
+                'target_modtime': None
+            })
+
+        # Files exist in target but not in source
+        for path in sorted(only_in_target):
+            target_modtime, target_size, _ = target[path]
+            differences.append({
+                'type': 'MISSING_IN_SOURCE',
+                'path': path,
+                'source_size': None,
+                'source_modtime': None,
+                'target_size': target_size,
+                'target_modtime': target_modtime
+            })
+
+        # Files exist in both, check for differences
+        # Identical (mod_time, size, crc) tuples are dropped with one C-level tuple comparison per path,
+        # so only the remaining candidates get the detailed size/modtime check (and the sort)
+        candidates = [path for path in in_both if source[path] != target[path]]
+        for path in sorted(candidates):
+            source_modtime, source_size, source_crc = source[path]
+            target_modtime, target_size, target_crc = target[path]
+            size_different = source_size != target_size
+            modtime_different = is_modtime_different(source_modtime, target_modtime)
             
-            if source_item and not target_item:
-                # File/folder exists in source but not in target
+            if size_different or modtime_different:
                 differences.append({
-                    'type': 'MISSING_IN_TARGET',
+                    'type': 'DIFFERENT',
                     'path': path,
-                    'source_size': source_item['size'],
-                    'source_modtime': source_item['mod_time'],
-                    'target_size': None,
-                    'target_modtime': None
+                    'source_size': source_size,
+                    'source_modtime': source_modtime,
+                    'target_size': target_size,
+                    'target_modtime': target_modtime,
+                    'size_different': size_different,
+                    'modtime_different': modtime_different,
+                    'source_crc': source_crc,
+                    'target_crc': target_crc
                 })
-            elif target_item and not source_item:
-                # File/folder exists in target but not in source
-                differences.append({
-                    'type': 'MISSING_IN_SOURCE',
-                    'path': path,
-                    'source_size': None,
-                    'source_modtime': None,
-                    'target_size': target_item['size'],
-                    'target_modtime': target_item['mod_time']
-                })
-            elif source_item and target_item:
-                # File/folder exists in both, check for differences
-                size_different = source_item['size'] != target_item['size']
-                # Parse mod_time strings and compare only up to seconds precision
-                try:
-                    source_dt = datetime.fromisoformat(source_item['mod_time'].replace('Z', '+00:00'))
-                    target_dt = datetime.fromisoformat(target_item['mod_time'].replace('Z', '+00:00'))
-                    # Compare only year, month, day, hour, minute, second (ignore microseconds)
-                    source_truncated = source_dt.replace(microsecond=0)
-                    target_truncated = target_dt.replace(microsecond=0)
-                    modtime_different = source_truncated != target_truncated
-                except (ValueError, TypeError):
-                    # Fallback to string comparison if parsing fails
-                    modtime_different = source_item['mod_time'] != target_item['mod_time']
-                
-                if size_different or modtime_different:
-                    differences.append({
-                        'type': 'DIFFERENT',
-                        'path': path,
-                        'source_size': source_item['size'],
-                        'source_modtime': source_item['mod_time'],
-                        'target_size': target_item['size'],
-                        'target_modtime': target_item['mod_time'],
-                        'size_different': size_different,
-                        'modtime_different': modtime_different
-                    })
         
+        # Optionally fetch CRC-32 of the changed files only (computed in-process for local roots, read from the
+        # remote's stored hashes otherwise). A CRC-32 of one side alone compares nothing, so nothing is fetched
+        # unless both backends have crc32; files of different size differ anyway and are skipped as well
+        changed = [diff for diff in differences if diff['type'] == 'DIFFERENT' and not diff['size_different']]
+        if fetch_changed_crc and not include_hash and changed:
+            if supports_crc32(root_src) and supports_crc32(root_dst):
+                source_crc32 = local_crc32 if is_local_path(root_src) else rclone_crc32
+                target_crc32 = local_crc32 if is_local_path(root_dst) else rclone_crc32
+                paths = [diff['path'] for diff in changed]
+                # One request or file read per path and side; both sides are fetched concurrently
+                with ThreadPoolExecutor(max_workers=16) as executor:
+                    source_crcs = executor.map(lambda path: source_crc32(root_src, path), paths)
+                    target_crcs = executor.map(lambda path: target_crc32(root_dst, path), paths)
+                    for diff, source_crc, target_crc in zip(changed, source_crcs, target_crcs):
+                        diff['source_crc'] = source_crc
+                        diff['target_crc'] = target_crc
+            else:
+                logging.info("CRC-32 of changed files not fetched: source or target backend has no crc32 hashes.")
+
+        # Files of equal size and equal CRC-32 on both sides (listed or fetched) have the same content and
+        # only differ in modtime, so they are not reported
+        same_content = {id(diff) for diff in changed if diff['source_crc'] and diff['source_crc'] == diff['target_crc']}
+        if same_content:
+            differences = [diff for diff in differences if id(diff) not in same_content]
+            logging.info(f"Skipped {len(same_content)} files with different modtime but equal size and CRC-32.")
+
         # Log differences
         logging.info(f"Found {len(differences)} differences between source and target:")
         logging.info("-" * 100)
@@ -221,30 +370,34 @@ def complete_file_list_check(root_src: str, root_dst: str, dry_run: bool = True)
         if differences:
             for diff in differences:
                 if diff['type'] == 'MISSING_IN_TARGET':
-                    logging.info(f"NEW FILE: {diff['path']} (Size: {diff['source_size']}, ModTime: {diff['source_modtime']})")
+                    logging.info("NEW FILE: %s (Size: %s, ModTime: %s)", diff['path'], diff['source_size'], diff['source_modtime'])
                 elif diff['type'] == 'MISSING_IN_SOURCE':
-                    logging.info(f"DELETED: {diff['path']} (Size: {diff['target_size']}, ModTime: {diff['target_modtime']})")
+                    logging.info("DELETED: %s (Size: %s, ModTime: %s)", diff['path'], diff['target_size'], diff['target_modtime'])
                 elif diff['type'] == 'DIFFERENT':
                     changes = []
                     if diff['size_different']:
                         changes.append(f"Size: {diff['source_size']} -> {diff['target_size']}")
                     if diff['modtime_different']:
                         changes.append(f"ModTime: {diff['source_modtime']} -> {diff['target_modtime']}")
-                    logging.info(f"CHANGED: {diff['path']} ({', '.join(changes)})")
+                    logging.info("CHANGED: %s (%s)", diff['path'], ', '.join(changes))
         else:
             logging.info("No differences found - source and target are identical!")
         
         logging.info("-" * 100)
         
         # Save differences to file
-        with open(f'{log_folder}/{start_datetime}_st_check_difflist.txt', 'w', encoding='utf-8') as f:
-            f.write("TYPE,PATH,SOURCE_SIZE,SOURCE_MODTIME,TARGET_SIZE,TARGET_MODTIME,SIZE_DIFF,MODTIME_DIFF\n")
-            for diff in differences:
-                size_diff = diff.get('size_different', False)
-                modtime_diff = diff.get('modtime_different', False)
-                f.write(f"{diff['type']},{diff['path']},{diff['source_size']},{diff['source_modtime']},{diff['target_size']},{diff['target_modtime']},{size_diff},{modtime_diff}\n")
+        with open_output('st_check_difflist.txt', pair_name) as f:
+            writer = csv.writer(f)
+            writer.writerow(['TYPE', 'PATH', 'SOURCE_SIZE', 'SOURCE_MODTIME', 'TARGET_SIZE', 'TARGET_MODTIME',
+                             'SIZE_DIFF', 'MODTIME_DIFF', 'SOURCE_CRC', 'TARGET_CRC'])
+            # None is written as 'None' to keep the previous file content
+            writer.writerows((diff['type'], diff['path'], str(diff['source_size']), str(diff['source_modtime']),
+                              str(diff['target_size']), str(diff['target_modtime']),
+                              diff.get('size_different', False), diff.get('modtime_different', False),
+                              diff.get('source_crc', ''), diff.get('target_crc', ''))
+                             for diff in differences)
 
-        logging.info(f"Saved differences to {log_folder}/{start_datetime}_st_check_difflist.txt")
+        logging.info(f"Saved differences to {f.name}")
 
 
     except Exception as e:
@@ -254,23 +407,44 @@ def complete_file_list_check(root_src: str, root_dst: str, dry_run: bool = True)
 
 
 
+def check_pair(pair_id: int, src: str, dst: str):
+    """Check one source-target pair in a worker thread; output files get a _pair<N> suffix."""
+    threading.current_thread().name = f"pair{pair_id}"
+    logging.info(f"Processing source: {src} -> destination: {dst}")
+    complete_file_list_check(src, dst, dry_run=False, dump_full_list=dump_full_list, pair_name=f"_pair{pair_id}")
+
+
 if __name__ == "__main__":
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Compare source and target file structures of the CSV pairs')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Number of pairs checked in parallel (default: 1)')
+    parser.add_argument('--tpslimit', type=float, default=tps_limit, help=f'Max API transactions per second of all pairs together, 0 for no limit (default: {tps_limit})')
+    parser.add_argument('--tpslimit-burst', type=int, default=tps_limit_burst, help=f'Max transactions burst above --tpslimit (default: {tps_limit_burst})')
+    args = parser.parse_args()
+
+    setup_logging(log_folder, thread_names=args.jobs > 1)
+
     logging.info(f"-" * 300)
     logging.info(f"START SYNCING FOLDERS FROM CSV FILE: {csv_file}")
     logging.info(f"-" * 300)
-    # Read source-target pairs from CSV file
-    folders_to_sync = []
-    
+
+    # Locate rclone.conf and start the rclone rcd daemon once for all pairs, using the
+    # rclone executable resolved by rclone_api (from PATH or its own download).
+    # All pairs share the daemon, so its --tpslimit is a global limit of their API calls
+    rc_args = []
+    if args.tpslimit > 0:
+        rc_args = ['--tpslimit', str(args.tpslimit), '--tpslimit-burst', str(args.tpslimit_burst)]
     try:
-        with open(csv_file, mode='r', newline='', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            next(reader)  # Skip header row (source, target)
-            for row in reader:
-                if len(row) < 2 or not row[0].strip() or not row[1].strip():
-                    continue  # Skip empty/invalid rows
-                src = row[0].strip().replace('\\', '/')  # Normalize to forward slashes
-                dst = row[1].strip().strip('"')  # Strip quotes and whitespace
-                folders_to_sync.append((src, dst))
+        config_path = find_rclone_config()
+        start_rc_daemon(config_path, Rclone(config_path).impl._exec.rclone_exe, rc_args)
+    except Exception as e:
+        print(f"Error starting rclone: {e}")
+        logging.error(f"Error starting rclone: {e}")
+        sys.exit(1)
+
+    try:
+        # Read source-target pairs from CSV file
+        folders_to_sync = read_folder_pairs(csv_file)
 
        
         if not folders_to_sync:
@@ -282,10 +456,22 @@ if __name__ == "__main__":
                 logging.info(f"Destination: {dst}")
                 logging.info("")
 
-            for src, dst in folders_to_sync:
-                logging.info(f"-" * 300)
-                logging.info(f"Processing source: {src} -> destination: {dst}")
-                complete_file_list_check(src, dst, dry_run=False)  # Set dry_run=False to perform actions
+            if args.jobs > 1:
+                # Pairs are independent and listing is network-bound, so they are checked in parallel
+                with ThreadPoolExecutor(max_workers=min(args.jobs, len(folders_to_sync))) as executor:
+                    futures = {executor.submit(check_pair, pair_id, src, dst): (src, dst)
+                               for pair_id, (src, dst) in enumerate(folders_to_sync, start=1)}
+                    for future in as_completed(futures):
+                        src, dst = futures[future]
+                        try:
+                            future.result()
+                        except Exception as e:
+                            logging.error(f"Check failed for {src} -> {dst}: {str(e)}")
+            else:
+                for src, dst in folders_to_sync:
+                    logging.info(f"-" * 300)
+                    logging.info(f"Processing source: {src} -> destination: {dst}")
+                    complete_file_list_check(src, dst, dry_run=False, dump_full_list=dump_full_list)  # Set dry_run=False to perform actions
 
     except Exception as e:
         logging.error(f"Error reading or processing CSV file: {str(e)}")
\ No newline at end of file